@@ -3,18 +3,97 @@ Coordinator Agent using Crew.AI
 Orchestrates the multi-agent workflow and synthesizes final reports
 """
 
+from datetime import datetime
 from typing import Dict, Any
-import json
-from loguru import logger
+import hashlib
 from crewai import Agent, Crew, Process
 
+from core import json_io
 from core.base_agent import BaseContractAgent
+from core.json_extract import JSONStreamScanner, parse_llm_json
 from core.state import (
     ContractState, AgentType, MessageType,
     ProcessingStatus, FinalReport
 )
 
 
+_NL = "\n"
+
+# Static synthesis scaffold, kept at module scope and placed before the
+# per-contract data so provider-side prompt caching can hit on it
+
+_SYNTHESIS_INSTRUCTIONS = """Synthesize a comprehensive executive contract analysis report from the contract data below.
+
+Provide your analysis in the following JSON format:
+{
+    "executive_summary": "3-4 paragraph executive summary highlighting key points",
+    "detailed_analysis": {
+        "contract_overview": "Brief overview of contract type and parties",
+        "key_findings": ["Finding 1", "Finding 2", "Finding 3"],
+        "legal_assessment": "Legal analysis summary",
+        "risk_summary": "Risk assessment summary"
+    },
+    "risk_matrix": {
+        "overall_risk": "Low|Medium|High|Critical",
+        "financial_risk": "Low|Medium|High|Critical",
+        "legal_risk": "Low|Medium|High|Critical",
+        "operational_risk": "Low|Medium|High|Critical"
+    },
+    "action_items": [
+        "Specific action item 1",
+        "Specific action item 2",
+        "Specific action item 3"
+    ],
+    "approval_recommendation": "Approve|Approve with Modifications|Reject|Requires Legal Review"
+}"""
+
+# Stable fingerprint of the invariant prompt portion, computed once at
+# import; the synthesis test cache folds it into its key so schema
+# edits invalidate stale cached reports cleanly
+SYNTHESIS_PROMPT_VERSION = hashlib.sha256(
+    _SYNTHESIS_INSTRUCTIONS.encode("utf-8")).hexdigest()[:12]
+
+# Field schema with defaults; report construction iterates this once,
+# which also drops any unknown keys the LLM invents
+_REPORT_SCHEMA: FinalReport = {
+    "executive_summary": "",
+    "detailed_analysis": {},
+    "risk_matrix": {},
+    "action_items": [],
+    "approval_recommendation": "Requires Review"
+}
+
+# Keys that distinguish the real synthesis report from other balanced
+# brace blobs in the stream - ReAct-style traces can echo the schema
+# template embedded in the task description, and that parses fine
+_REPORT_MARKER_KEYS = ("executive_summary", "risk_matrix")
+
+# Concrete levels a filled-in risk matrix uses; the schema template
+# instead carries the "Low|Medium|High|Critical" placeholder string
+_RISK_LEVELS = frozenset(("Low", "Medium", "High", "Critical"))
+
+
+def _looks_like_report(data: Any) -> bool:
+    """
+    Whether a scanned JSON object is a substantive synthesis report
+
+    Key presence alone is not enough: the schema template embedded in
+    the task instructions is itself valid JSON with both marker keys,
+    so an echoed template would pass a shape check. A real report has
+    concrete risk levels, so every risk_matrix value must come from
+    the Low/Medium/High/Critical set - the template's pipe-joined
+    placeholders fail that.
+    """
+    if not isinstance(data, dict):
+        return False
+    if not all(key in data for key in _REPORT_MARKER_KEYS):
+        return False
+    risk_matrix = data["risk_matrix"]
+    if not isinstance(risk_matrix, dict) or not risk_matrix:
+        return False
+    return all(value in _RISK_LEVELS for value in risk_matrix.values())
+
+
 class CoordinatorAgent(BaseContractAgent):
     """
     The Coordinator Agent orchestrates all other agents using Crew.AI
@@ -44,10 +123,10 @@ class CoordinatorAgent(BaseContractAgent):
             role=self.get_role(),
             goal=self.get_goal(),
             backstory=self.get_backstory(),
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=True,  # Can delegate to other agents
-            max_iter=5,
-            llm=self.model
+            max_iter=3,
+            llm=self.llm
         )
 
     async def process(self, state: ContractState) -> ContractState:
@@ -82,76 +161,80 @@ class CoordinatorAgent(BaseContractAgent):
             # Build synthesis context
             synthesis_context = self._build_synthesis_context(state)
 
-            # Create synthesis task
+            # Create synthesis task (static schema first, contract data last
+            # so the provider prompt cache can hit on the schema block).
+            # Per-run agent: concurrent analyses must not share executor
+            # state through self.agent
+            agent = self.fresh_agent()
             synthesis_task = self.create_task(
-                description=f"""Synthesize a comprehensive executive contract analysis report from the following data:
-
-{synthesis_context}
-
-Provide your analysis in the following JSON format:
-{{
-    "executive_summary": "3-4 paragraph executive summary highlighting key points",
-    "detailed_analysis": {{
-        "contract_overview": "Brief overview of contract type and parties",
-        "key_findings": ["Finding 1", "Finding 2", "Finding 3"],
-        "legal_assessment": "Legal analysis summary",
-        "risk_summary": "Risk assessment summary"
-    }},
-    "risk_matrix": {{
-        "overall_risk": "Low|Medium|High|Critical",
-        "financial_risk": "Low|Medium|High|Critical",
-        "legal_risk": "Low|Medium|High|Critical",
-        "operational_risk": "Low|Medium|High|Critical"
-    }},
-    "action_items": [
-        "Specific action item 1",
-        "Specific action item 2",
-        "Specific action item 3"
-    ],
-    "approval_recommendation": "Approve|Approve with Modifications|Reject|Requires Legal Review"
-}}""",
-                expected_output="JSON formatted comprehensive contract analysis report"
+                description=self.compose_prompt(
+                    _SYNTHESIS_INSTRUCTIONS, synthesis_context),
+                expected_output="JSON formatted comprehensive contract analysis report",
+                agent=agent
             )
 
-            # Create crew with just the coordinator
+            # Create crew with just the coordinator; stream the result so
+            # JSON extraction overlaps generation instead of waiting for
+            # the full response
             synthesis_crew = Crew(
-                agents=[self.agent],
+                agents=[agent],
                 tasks=[synthesis_task],
                 process=Process.sequential,
-                verbose=True
+                verbose=self.verbose,
+                stream=True
             )
 
             # Execute synthesis
             self.log_processing_step(
-                state, "Executing synthesis task via Crew.AI")
-            result = synthesis_crew.kickoff()
-
-            # Parse result
-            report_data = self._parse_result(result)
-
-            # Create FinalReport
+                state, "Executing synthesis task via Crew.AI (streaming)")
+            result_stream = await self.run_crew(synthesis_crew)
+
+            # Scan chunks as they arrive; every balanced object in the
+            # stream is parsed and vetted, and the last one that passes
+            # wins - intermediate thoughts can carry plausible drafts,
+            # but the final answer comes last. Rejected objects (echoed
+            # schema templates, tool-call blobs) are discarded and
+            # scanning resumes from the scanner's tail
+            scanner = JSONStreamScanner()
+            report_data = None
+            async for chunk in result_stream:
+                pending = chunk.content
+                while pending:
+                    json_str = scanner.feed(pending)
+                    if json_str is None:
+                        break
+                    pending, scanner = scanner.tail, JSONStreamScanner()
+                    try:
+                        candidate = json_io.loads(json_str)
+                    except ValueError:
+                        continue
+                    if _looks_like_report(candidate):
+                        report_data = candidate
+
+            if report_data is None:
+                # Fall back to the shared parse ladder on the final result
+                report_data = self._parse_result(result_stream.result)
+
+            # Create FinalReport from the schema in one pass
             final_report: FinalReport = {
-                "executive_summary": report_data.get("executive_summary", ""),
-                "detailed_analysis": report_data.get("detailed_analysis", {}),
-                "risk_matrix": report_data.get("risk_matrix", {}),
-                "action_items": report_data.get("action_items", []),
-                "approval_recommendation": report_data.get("approval_recommendation", "Requires Review")
+                key: report_data.get(key, default)
+                for key, default in _REPORT_SCHEMA.items()
             }
 
             # Add to state
             state["final_report"] = final_report
 
-            # Update status to completed
-            from datetime import datetime
-            state = self.update_status(state, ProcessingStatus.COMPLETED)
-            state["completed_at"] = datetime.utcnow().isoformat()
-
-            # Send completion message
-            state = self.send_message(
+            # Completed status, timestamp and completion broadcast in a
+            # single state pass
+            state = self.batch_update(
                 state,
-                to_agent=None,
-                message_type=MessageType.COMPLETION,
-                content={"message": "Contract analysis completed successfully"}
+                status=ProcessingStatus.COMPLETED,
+                completed_at=datetime.utcnow().isoformat(),
+                messages=[{
+                    "to_agent": None,
+                    "message_type": MessageType.COMPLETION,
+                    "content": {"message": "Contract analysis completed successfully"}
+                }]
             )
 
             self.log_processing_step(
@@ -169,57 +252,43 @@ Provide your analysis in the following JSON format:
 
     def _parse_result(self, result: Any) -> Dict[str, Any]:
         """Parse the Crew.AI result into JSON"""
-        try:
-            # If result is already a dict
-            if isinstance(result, dict):
-                return result
-
-            # Convert to string
-            result_str = str(result)
-
-            # Try to parse as JSON
-            try:
-                return json.loads(result_str)
-            except json.JSONDecodeError:
-                # Try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(
-                    r'```json\s*(\{.*?\})\s*```', result_str, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group(1))
-
-                # Try to find JSON object in the text
-                json_match = re.search(
-                    r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', result_str, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group(0))
-
-                raise ValueError("Could not extract JSON from result")
-
-        except Exception as e:
-            logger.error(f"Failed to parse result: {str(e)}")
-            # Return a default structure
-            return {
-                "executive_summary": str(result)[:500],
-                "detailed_analysis": {},
-                "risk_matrix": {"overall_risk": "Medium"},
-                "action_items": ["Review raw output for details"],
-                "approval_recommendation": "Requires Review"
-            }
+        return parse_llm_json(result, self._create_fallback_report)
+
+    def _create_fallback_report(self, text: str) -> Dict[str, Any]:
+        """Create a basic report structure if parsing fails"""
+        return {
+            "executive_summary": text[:500],
+            "detailed_analysis": {},
+            "risk_matrix": {"overall_risk": "Medium"},
+            "action_items": ["Review raw output for details"],
+            "approval_recommendation": "Requires Review"
+        }
 
     def _build_synthesis_context(self, state: ContractState) -> str:
         """Build the context for synthesis"""
-        contract_id = state["contract_metadata"]["contract_id"]
-        filename = state["contract_metadata"]["filename"]
-
+        metadata = state["contract_metadata"]
         parser_data = state["parser_output"]
         legal_data = state["legal_analysis"]
         risk_data = state["risk_assessment"]
 
+        # Bind the repeated lookups once and slice once
+        key_terms = legal_data.get('key_terms', [])
+        obligations = legal_data.get('obligations', [])
+        clauses = legal_data.get('clauses_identified', [])
+        critical_risks = risk_data.get('critical_risks', [])
+        recommendations = risk_data.get('recommendations', [])[:5]
+
+        # Plain lines are cheaper to build than indented JSON and just as
+        # readable for the LLM
+        risk_categories_block = _NL.join(
+            f"  {name}: {info}"
+            for name, info in risk_data.get('risk_categories', {}).items()
+        )
+
         context = f"""
 CONTRACT INFORMATION:
-- Contract ID: {contract_id}
-- Filename: {filename}
+- Contract ID: {metadata['contract_id']}
+- Filename: {metadata['filename']}
 - Pages: {parser_data.get('metadata', {}).get('num_pages', 'Unknown')}
 
 DOCUMENT STRUCTURE:
@@ -229,25 +298,25 @@ Sections: {', '.join(list(parser_data.get('structured_sections', {}).keys())[:5]
 LEGAL ANALYSIS:
 Contract Type: {legal_data.get('contract_type', 'Unknown')}
 Parties: {', '.join(legal_data.get('parties_involved', []))}
-Key Terms: {len(legal_data.get('key_terms', []))}
-Obligations: {len(legal_data.get('obligations', []))}
+Key Terms: {len(key_terms)}
+Obligations: {len(obligations)}
 Jurisdiction: {legal_data.get('jurisdiction', 'Not specified')}
 
 Key Clauses:
-{self._format_list(legal_data.get('clauses_identified', []), 'type', 'summary')}
+{self._format_list(clauses, 'type', 'summary')}
 
 RISK ASSESSMENT:
 Overall Risk Score: {risk_data.get('overall_risk_score', 0)}/10
-Critical Risks: {len(risk_data.get('critical_risks', []))}
+Critical Risks: {len(critical_risks)}
 
 Risk Categories:
-{json.dumps(risk_data.get('risk_categories', {}), indent=2)}
+{risk_categories_block}
 
 Critical Risks:
-{self._format_list(risk_data.get('critical_risks', []), 'category', 'description')}
+{self._format_list(critical_risks, 'category', 'description')}
 
 Recommendations:
-{chr(10).join([f"- {rec}" for rec in risk_data.get('recommendations', [])[:5]])}
+{_NL.join(f"- {rec}" for rec in recommendations)}
 
 USER INSTRUCTIONS: {state.get('user_instructions', 'None')}
 PRIORITY: {state.get('priority_level', 'medium')}
@@ -259,11 +328,10 @@ PRIORITY: {state.get('priority_level', 'medium')}
         if not items:
             return "None identified"
 
-        formatted = []
-        for i, item in enumerate(items[:5], 1):
-            formatted.append(
-                f"  {i}. {item.get(key1, 'N/A')}: {item.get(key2, 'N/A')}")
-        return "\n".join(formatted)
+        return _NL.join(
+            f"  {i}. {item.get(key1, 'N/A')}: {item.get(key2, 'N/A')}"
+            for i, item in enumerate(items[:5], 1)
+        )
 
     def validate_input(self, state: ContractState) -> bool:
         """Coordinator can always process"""
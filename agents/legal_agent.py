@@ -5,15 +5,101 @@ Analyzes contract terms, clauses, and obligations using Crew.AI
 
 from typing import Dict, Any
 from crewai import Agent, Crew, Process
-from loguru import logger
-import json
-import re
+import asyncio
+import hashlib
 
 from core.base_agent import BaseContractAgent
+from core.bounded_cache import BoundedCache
 from core.state import (
     ContractState, AgentType, MessageType,
     ProcessingStatus, LegalAnalysis
 )
+from core.json_extract import is_fallback, parse_llm_json
+
+
+# Static sub-task scaffolds, kept at module scope so every call shares an
+# identical prompt prefix (required for provider-side prompt caching)
+
+_PARTIES_AND_TYPE_INSTRUCTIONS = """Identify the contract type and all parties in the contract data below.
+
+Your analysis must include:
+
+1. CONTRACT TYPE: What type of agreement is this?
+2. PARTIES: Identify all parties involved (full legal names)
+
+Provide output in this JSON format:
+{
+    "contract_type": "e.g., Non-Disclosure Agreement",
+    "parties_involved": ["Party 1 Legal Name", "Party 2 Legal Name"]
+}"""
+
+_CLAUSES_INSTRUCTIONS = """Extract the key terms and major clauses from the contract data below.
+
+Your analysis must include:
+
+1. KEY TERMS: Extract and define critical terms (at least 3-5)
+2. CLAUSES: Identify major clauses (confidentiality, liability, indemnification, termination, etc.)
+3. PRELIMINARY RISK FLAGS: Note any concerns spotted while reviewing the clauses
+
+Provide output in this JSON format:
+{
+    "key_terms": [
+        {"term": "Term Name", "definition": "Definition", "importance": "high|medium|low"}
+    ],
+    "clauses_identified": [
+        {
+            "type": "Clause type (e.g., Confidentiality)",
+            "summary": "Brief summary of the clause",
+            "risk_level": "low|medium|high",
+            "favorability": "favorable|neutral|unfavorable"
+        }
+    ],
+    "preliminary_risk_flags": {
+        "liability_concerns": ["Concern 1"],
+        "compliance_concerns": ["Concern 1"],
+        "unbalanced_terms": ["Concern 1"]
+    }
+}"""
+
+_OBLIGATIONS_INSTRUCTIONS = """List all obligations for each party in the contract data below.
+
+Your analysis must include:
+
+1. OBLIGATIONS: List all obligations for each party with deadlines
+
+Provide output in this JSON format:
+{
+    "obligations": [
+        {
+            "party": "Party Name",
+            "description": "What they must do",
+            "deadline": "When or duration",
+            "consequence": "What happens if not met"
+        }
+    ]
+}"""
+
+_JURISDICTION_DATES_INSTRUCTIONS = """Determine the governing law and critical dates for the contract data below.
+
+Your analysis must include:
+
+1. JURISDICTION: What jurisdiction/governing law applies?
+2. DATES: Effective date, termination date, any critical deadlines
+
+Provide output in this JSON format:
+{
+    "jurisdiction": "State/Country",
+    "effective_date": "YYYY-MM-DD or description",
+    "termination_date": "YYYY-MM-DD or description"
+}"""
+
+# Sub-task results keyed by model + full task description hash, same
+# scheme as the risk cache. Contracts built from shared boilerplate
+# produce byte-identical contexts, so repeated sub-tasks skip their
+# LLM calls entirely; editing an instruction block invalidates its
+# entries automatically because the description is part of the key.
+# LRU-bounded like the other result caches.
+_legal_cache: Dict[str, Dict[str, Any]] = BoundedCache(maxsize=256)
 
 
 class LegalAgent(BaseContractAgent):
@@ -53,9 +139,9 @@ class LegalAgent(BaseContractAgent):
             role=self.get_role(),
             goal=self.get_goal(),
             backstory=self.get_backstory(),
-            verbose=True,
+            verbose=self.verbose,
             allow_delegation=False,
-            llm=self.model
+            llm=self.llm
         )
 
     async def process(self, state: ContractState) -> ContractState:
@@ -76,69 +162,41 @@ class LegalAgent(BaseContractAgent):
             self.log_processing_step(
                 state, f"Starting legal analysis for {contract_id}")
 
-            # Create legal analysis task
-            analysis_task = self.create_task(
-                description=f"""Conduct a comprehensive legal analysis of this contract:
-
-CONTRACT SECTIONS:
-{json.dumps(parser_output['structured_sections'], indent=2)}
+            # Build the shared contract context once for all sub-tasks.
+            # Plain "SECTION: summary" lines cost 20-40% fewer prompt
+            # tokens than indented JSON with no loss of information.
+            sections_block = "\n".join(
+                f"{name}: {content}"
+                for name, content in parser_output['structured_sections'].items()
+            )
+            contract_context = f"""CONTRACT SECTIONS:
+{sections_block}
 
 RAW TEXT EXCERPT:
-{parser_output['raw_text'][:1500]}...
-
-Your analysis must include:
-
-1. CONTRACT TYPE: What type of agreement is this?
-2. PARTIES: Identify all parties involved (full legal names)
-3. KEY TERMS: Extract and define critical terms (at least 3-5)
-4. OBLIGATIONS: List all obligations for each party with deadlines
-5. CLAUSES: Identify major clauses (confidentiality, liability, indemnification, termination, etc.)
-6. JURISDICTION: What jurisdiction/governing law applies?
-7. DATES: Effective date, termination date, any critical deadlines
+{parser_output['raw_text'][:1500]}..."""
 
-Provide output in this JSON format:
-{{
-    "contract_type": "e.g., Non-Disclosure Agreement",
-    "parties_involved": ["Party 1 Legal Name", "Party 2 Legal Name"],
-    "key_terms": [
-        {{"term": "Term Name", "definition": "Definition", "importance": "high|medium|low"}}
-    ],
-    "obligations": [
-        {{
-            "party": "Party Name",
-            "description": "What they must do",
-            "deadline": "When or duration",
-            "consequence": "What happens if not met"
-        }}
-    ],
-    "clauses_identified": [
-        {{
-            "type": "Clause type (e.g., Confidentiality)",
-            "summary": "Brief summary of the clause",
-            "risk_level": "low|medium|high",
-            "favorability": "favorable|neutral|unfavorable"
-        }}
-    ],
-    "jurisdiction": "State/Country",
-    "effective_date": "YYYY-MM-DD or description",
-    "termination_date": "YYYY-MM-DD or description"
-}}""",
-                expected_output="JSON formatted legal analysis"
-            )
+            # Run the independent analysis sub-tasks concurrently -
+            # each is a separate LLM call, so overlapping them gives
+            # near-linear wall-clock speedup
+            self.log_processing_step(
+                state, "Executing legal analysis sub-tasks concurrently")
 
-            # Execute analysis
-            analysis_crew = Crew(
-                agents=[self.agent],
-                tasks=[analysis_task],
-                process=Process.sequential,
-                verbose=False
+            results = await asyncio.gather(
+                self._analyze_parties_and_type(contract_context),
+                self._extract_clauses(contract_context),
+                self._extract_obligations(contract_context),
+                self._extract_jurisdiction_dates(contract_context)
             )
 
-            self.log_processing_step(state, "Executing legal analysis task")
-            result = analysis_crew.kickoff()
+            # Merge sub-task results into a single analysis dict
+            analysis_data: Dict[str, Any] = {}
+            for partial in results:
+                analysis_data.update(partial)
 
-            # Parse result
-            analysis_data = self._parse_crew_result(result)
+            # Risk flags collected during the same clauses pass seed the
+            # RiskAgent so it does not re-prime the LLM with raw text
+            state["legal_plus_risk_seed"] = analysis_data.pop(
+                "preliminary_risk_flags", None)
 
             # Create LegalAnalysis
             legal_analysis: LegalAnalysis = {
@@ -178,33 +236,95 @@ Provide output in this JSON format:
             state = self.add_error(state, f"Legal analysis failed: {str(e)}")
             raise
 
+    async def _run_analysis_task(
+        self,
+        description: str,
+        expected_output: str
+    ) -> Dict[str, Any]:
+        """Execute a single analysis sub-task via its own Crew"""
+        cache_key = hashlib.sha256(
+            (self.model + ":" + description).encode("utf-8")
+        ).hexdigest()
+        cached = _legal_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        # The gathered sub-tasks run concurrently, so each crew gets
+        # its own Agent instance; sharing self.agent across overlapping
+        # kickoffs crosses executors and swaps sub-task results
+        agent = self.fresh_agent()
+        task = self.create_task(
+            description=description,
+            expected_output=expected_output,
+            agent=agent
+        )
+
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=False
+        )
+
+        result = await self.run_crew(crew)
+        parsed = self._parse_crew_result(result)
+        # Don't let a transiently malformed response pin its fallback
+        # defaults in the cache for the lifetime of the process
+        if not is_fallback(parsed):
+            _legal_cache[cache_key] = parsed
+        return parsed
+
+    async def _analyze_parties_and_type(
+        self, contract_context: str
+    ) -> Dict[str, Any]:
+        """Sub-task: identify the contract type and the parties involved"""
+        data = await self._run_analysis_task(
+            description=self.compose_prompt(
+                _PARTIES_AND_TYPE_INSTRUCTIONS, contract_context),
+            expected_output="JSON with contract_type and parties_involved"
+        )
+        return {k: data[k] for k in
+                ("contract_type", "parties_involved") if k in data}
+
+    async def _extract_clauses(
+        self, contract_context: str
+    ) -> Dict[str, Any]:
+        """Sub-task: extract key terms and major clauses"""
+        data = await self._run_analysis_task(
+            description=self.compose_prompt(
+                _CLAUSES_INSTRUCTIONS, contract_context),
+            expected_output="JSON with key_terms and clauses_identified"
+        )
+        return {k: data[k] for k in
+                ("key_terms", "clauses_identified",
+                 "preliminary_risk_flags") if k in data}
+
+    async def _extract_obligations(
+        self, contract_context: str
+    ) -> Dict[str, Any]:
+        """Sub-task: extract each party's obligations and deadlines"""
+        data = await self._run_analysis_task(
+            description=self.compose_prompt(
+                _OBLIGATIONS_INSTRUCTIONS, contract_context),
+            expected_output="JSON with obligations"
+        )
+        return {"obligations": data["obligations"]} if "obligations" in data else {}
+
+    async def _extract_jurisdiction_dates(
+        self, contract_context: str
+    ) -> Dict[str, Any]:
+        """Sub-task: determine jurisdiction and critical dates"""
+        data = await self._run_analysis_task(
+            description=self.compose_prompt(
+                _JURISDICTION_DATES_INSTRUCTIONS, contract_context),
+            expected_output="JSON with jurisdiction, effective_date and termination_date"
+        )
+        return {k: data[k] for k in
+                ("jurisdiction", "effective_date", "termination_date") if k in data}
+
     def _parse_crew_result(self, result: Any) -> Dict[str, Any]:
         """Parse Crew.AI result into structured format"""
-        try:
-            result_str = str(result)
-
-            # Try to parse as JSON
-            try:
-                return json.loads(result_str)
-            except json.JSONDecodeError:
-                # Extract JSON from markdown
-                json_match = re.search(
-                    r'```json\s*(\{.*?\})\s*```', result_str, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group(1))
-
-                # Extract any JSON object
-                json_match = re.search(
-                    r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', result_str, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group(0))
-
-                # Fallback
-                return self._create_fallback_analysis()
-
-        except Exception as e:
-            logger.error(f"Failed to parse legal analysis result: {str(e)}")
-            return self._create_fallback_analysis()
+        return parse_llm_json(result, lambda _: self._create_fallback_analysis())
 
     def _create_fallback_analysis(self) -> Dict[str, Any]:
         """Create a basic analysis structure if parsing fails"""
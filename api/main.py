@@ -3,14 +3,24 @@ FastAPI Application
 Main API endpoints for the Contract Intelligence System
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
+import asyncio
+import hashlib
 import os
+import time
 from loguru import logger
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 from api.models import (
     HealthResponse,
     ContractUploadResponse,
@@ -22,6 +32,9 @@ from api.models import (
 )
 from core.orchestrator import ContractAnalysisOrchestrator
 from core.config import get_settings
+from core.result_store import get_result_store
+from core.log_setup import configure_logging
+from core import json_io
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,7 +42,11 @@ app = FastAPI(
     description="Multi-agent AI system for contract analysis and risk assessment",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # Serialize responses through orjson; large final_report bodies are
+    # nested dicts where the Rust encoder is several times faster than
+    # stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -44,29 +61,107 @@ app.add_middleware(
 # Initialize orchestrator (single instance for the app)
 orchestrator: Optional[ContractAnalysisOrchestrator] = None
 
-# Store analysis results in memory (in production, use database)
-analysis_cache: dict = {}
+# Store analysis results in memory (in production, use database).
+# Bounded LRU: reads refresh recency, inserts evict the oldest entry
+# once the cap is reached so the cache cannot grow without limit.
+MAX_CACHED_ANALYSES = 256
+analysis_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+# Content-hash index so re-uploading byte-identical files returns the
+# finished analysis instead of re-running the whole pipeline
+content_index: dict = {}
+
+# Admission semaphore for /api/analyze: a burst of uploads queues here
+# instead of firing N simultaneous orchestrator runs at the LLM
+# provider. Created at startup so it binds to the serving event loop.
+analysis_sem: Optional[asyncio.Semaphore] = None
+MAX_CONCURRENT_ANALYSES = 0
+
+# Upload chunk size: large enough to amortize await overhead, small
+# enough that partial reads show up quickly against the size cap
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_upload(file: UploadFile) -> tuple:
+    """
+    Read an upload in chunks, hashing as bytes arrive
+
+    Reading incrementally keeps the dedupe hash off the critical path
+    (it is finished the moment the last chunk lands) and lets oversized
+    uploads be rejected as soon as they cross the configured cap,
+    instead of after buffering the whole body. Uploads that declare an
+    oversize length are refused before reading a single byte, and PDFs
+    whose first bytes are not the %PDF magic are dropped after one
+    chunk rather than buffered, parsed, and paid for in LLM calls.
+
+    Returns:
+        (content bytes, sha256 hex digest)
+
+    Raises:
+        HTTPException: 413 when the upload exceeds max_file_size_mb,
+            415 when a .pdf upload lacks the PDF magic bytes
+    """
+    max_bytes = get_settings().max_file_size_mb * 1024 * 1024
+
+    # O(1) reject using the size the client declared, before any read
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds {get_settings().max_file_size_mb}MB limit"
+        )
+
+    hasher = hashlib.sha256()
+    buf = bytearray()
+
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        # Sniff the magic bytes on the first chunk: a mislabeled .pdf
+        # would otherwise sail through to PyPDF2 and fail there
+        if not buf and file.filename.endswith('.pdf') \
+                and not chunk.startswith(b'%PDF'):
+            raise HTTPException(
+                status_code=415,
+                detail="File has a .pdf extension but is not a PDF"
+            )
+        buf += chunk
+        hasher.update(chunk)
+        if len(buf) > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds {get_settings().max_file_size_mb}MB limit"
+            )
+
+    return bytes(buf), hasher.hexdigest()
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the orchestrator on startup"""
-    global orchestrator
+    global orchestrator, analysis_sem, MAX_CONCURRENT_ANALYSES
+
+    # Move log writes off the event loop before the chatty agents start
+    configure_logging()
 
     logger.info("Starting Contract Intelligence System API")
 
+    MAX_CONCURRENT_ANALYSES = get_settings().max_concurrent_analyses
+    analysis_sem = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
     try:
-        orchestrator = ContractAnalysisOrchestrator()
+        # Agents construct concurrently, so cold start pays for the
+        # slowest single agent instead of all four in sequence
+        orchestrator = await ContractAnalysisOrchestrator.create()
         logger.success("Orchestrator initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize orchestrator: {str(e)}")
         raise
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with simple UI"""
-    return """
+# Root page encoded once at import time; the handler serves the same
+# bytes on every GET / instead of rebuilding a multi-KB string
+_ROOT_HTML: bytes = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -226,28 +321,68 @@ async def root():
                 formData.append('user_instructions', instructions);
                 formData.append('priority_level', priority);
                 
+                // Stream stage events so progress appears as each agent
+                // finishes (EventSource cannot POST uploads, so read the
+                // SSE body through fetch instead)
+                const stageLabels = {
+                    parser: '📄 Document parsed',
+                    legal: '⚖️ Legal analysis complete',
+                    risk: '🎯 Risk assessment complete'
+                };
+
                 try {
-                    const response = await fetch('/api/analyze', {
+                    const response = await fetch('/api/analyze/stream', {
                         method: 'POST',
                         body: formData
                     });
-                    
-                    const result = await response.json();
-                    
-                    if (response.ok) {
-                        statusDiv.className = 'status success';
-                        statusDiv.innerHTML = `
-                            <h3>✅ Analysis Complete!</h3>
-                            <p><strong>Contract ID:</strong> ${result.contract_id}</p>
-                            <p><strong>Status:</strong> ${result.status}</p>
-                            <p><strong>Recommendation:</strong> ${result.final_report.approval_recommendation}</p>
-                            <p><strong>Overall Risk:</strong> ${result.final_report.risk_matrix.overall_risk}</p>
-                            <br>
-                            <p><a href="/api/results/${result.contract_id}" target="_blank">View Full Report (JSON)</a></p>
-                        `;
-                    } else {
-                        throw new Error(result.detail || 'Analysis failed');
+
+                    if (!response.ok) {
+                        const error = await response.json();
+                        throw new Error(error.detail || 'Analysis failed');
+                    }
+
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    let result = null;
+
+                    while (true) {
+                        const { done, value } = await reader.read();
+                        if (done) break;
+                        buffer += decoder.decode(value, { stream: true });
+
+                        let boundary;
+                        while ((boundary = buffer.indexOf('\\n\\n')) !== -1) {
+                            const frame = buffer.slice(0, boundary);
+                            buffer = buffer.slice(boundary + 2);
+                            if (!frame.startsWith('data: ')) continue;
+
+                            const event = JSON.parse(frame.slice(6));
+                            if (event.stage === 'error') {
+                                throw new Error(event.detail);
+                            } else if (event.stage === 'final') {
+                                result = event.result;
+                            } else {
+                                statusDiv.innerHTML +=
+                                    `<br>${stageLabels[event.stage] || event.stage}`;
+                            }
+                        }
+                    }
+
+                    if (!result) {
+                        throw new Error('Analysis stream ended without a result');
                     }
+
+                    statusDiv.className = 'status success';
+                    statusDiv.innerHTML = `
+                        <h3>✅ Analysis Complete!</h3>
+                        <p><strong>Contract ID:</strong> ${result.contract_id}</p>
+                        <p><strong>Status:</strong> ${result.status}</p>
+                        <p><strong>Recommendation:</strong> ${result.final_report.approval_recommendation}</p>
+                        <p><strong>Overall Risk:</strong> ${result.final_report.risk_matrix.overall_risk}</p>
+                        <br>
+                        <p><a href="/api/results/${result.contract_id}" target="_blank">View Full Report (JSON)</a></p>
+                    `;
                 } catch (error) {
                     statusDiv.className = 'status error';
                     statusDiv.innerHTML = `
@@ -259,7 +394,39 @@ async def root():
         </script>
     </body>
     </html>
+    """.encode("utf-8")
+
+_ROOT_HTML_ETAG = f'"{hashlib.sha256(_ROOT_HTML).hexdigest()[:16]}"'
+
+
+@app.get("/")
+async def root(request: Request):
+    """Root endpoint with simple UI"""
+    # Conditional-request short-circuit: browsers revalidating the page
+    # get an empty 304 instead of the full body
+    if request.headers.get("if-none-match") == _ROOT_HTML_ETAG:
+        return Response(status_code=304, headers={"ETag": _ROOT_HTML_ETAG})
+
+    return Response(
+        content=_ROOT_HTML,
+        media_type="text/html",
+        headers={
+            "Cache-Control": "public, max-age=3600",
+            "ETag": _ROOT_HTML_ETAG
+        }
+    )
+
+
+@lru_cache(maxsize=1)
+def _iso_now(second_bucket: int) -> str:
     """
+    ISO timestamp cached per wall-clock second
+
+    /health is polled constantly by liveness probes; formatting the
+    same second's timestamp once per second instead of per hit keeps
+    the endpoint allocation-free on the hot path.
+    """
+    return datetime.now(timezone.utc).isoformat()
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -271,14 +438,71 @@ async def health_check():
 
     status = orchestrator.get_status()
 
+    in_flight = 0
+    if analysis_sem is not None:
+        in_flight = MAX_CONCURRENT_ANALYSES - analysis_sem._value
+
     return HealthResponse(
         status="healthy",
-        timestamp=datetime.utcnow().isoformat(),
+        timestamp=_iso_now(int(time.time())),
         version="1.0.0",
-        agents_status=status["agents"]
+        agents_status=status["agents"],
+        analyses_in_flight=in_flight
     )
 
 
+def _check_memory_pressure() -> None:
+    """
+    Shed load before buffering an upload if memory is already tight
+
+    An analysis allocates several times the document size in prompt
+    strings and parsed state, so both analyze endpoints reject with a
+    503 under pressure rather than tipping the worker over.
+    """
+    if psutil is None:
+        return
+    memory_percent = psutil.virtual_memory().percent
+    if memory_percent > get_settings().max_memory_percent:
+        logger.warning(
+            f"Rejecting analysis request: memory at {memory_percent:.0f}%")
+        raise HTTPException(
+            status_code=503,
+            detail="Server under memory pressure, retry later"
+        )
+
+
+def _lookup_cached_response(content_hash: str) -> Optional[ContractAnalysisResponse]:
+    """
+    Find a finished analysis for identical content, if one exists
+
+    Checks the per-worker LRU first, then the shared result store so a
+    duplicate upload hitting a different worker is also free. Returns
+    None when the content has not been analyzed before.
+    """
+    cached_id = content_index.get(content_hash)
+    if cached_id is not None:
+        cached_state = analysis_cache.get(cached_id)
+        if cached_state is not None:
+            analysis_cache.move_to_end(cached_id)
+            logger.info(
+                f"Returning cached analysis {cached_id} for re-uploaded content")
+            return _build_analysis_response(cached_state)
+        # Entry was evicted from the LRU; drop the stale index
+        content_index.pop(content_hash, None)
+
+    store = get_result_store()
+    stored_id = store.get_id_by_hash(content_hash)
+    if stored_id is not None:
+        stored_response = store.get_response(stored_id)
+        if stored_response is not None:
+            logger.info(
+                f"Returning stored analysis {stored_id} for re-uploaded content")
+            return ContractAnalysisResponse.model_validate_json(
+                stored_response)
+
+    return None
+
+
 @app.post("/api/analyze", response_model=ContractAnalysisResponse)
 async def analyze_contract(
     file: UploadFile = File(...),
@@ -294,6 +518,8 @@ async def analyze_contract(
     """
     logger.info(f"Received analysis request for: {file.filename}")
 
+    _check_memory_pressure()
+
     # Validate file type
     if not file.filename.endswith(('.pdf', '.txt')):
         raise HTTPException(
@@ -301,78 +527,163 @@ async def analyze_contract(
             detail="Only PDF and TXT files are supported"
         )
 
+    # Read in chunks so the hash is computed as bytes arrive and
+    # oversized uploads are rejected mid-stream
+    content, content_hash = await _read_upload(file)
+    file_size = len(content)
+
+    logger.info(f"File uploaded: {file.filename} ({file_size} bytes)")
+
     try:
-        # Read file content (in production, save to disk or S3)
-        content = await file.read()
-        file_size = len(content)
-
-        logger.info(f"File uploaded: {file.filename} ({file_size} bytes)")
-
-        # Run analysis
-        state = await orchestrator.analyze_contract(
-            filename=file.filename,
-            file_size=file_size,
-            user_instructions=user_instructions,
-            priority_level=priority_level
-        )
+        # Identical bytes mean an identical analysis; serve it from the
+        # caches instead of paying for the pipeline again
+        cached_response = _lookup_cached_response(content_hash)
+        if cached_response is not None:
+            return cached_response
+
+        # Run analysis, bounded by the admission semaphore so bursts
+        # queue here rather than triggering provider rate limits
+        async with analysis_sem:
+            state = await orchestrator.analyze_contract(
+                filename=file.filename,
+                file_size=file_size,
+                user_instructions=user_instructions,
+                priority_level=priority_level,
+                file_content=content
+            )
 
-        # Cache the result
-        analysis_cache[state["contract_metadata"]["contract_id"]] = state
+        # Cache the result, evicting the least recently used entry
+        # once the cap is reached
+        contract_id = state["contract_metadata"]["contract_id"]
+        analysis_cache[contract_id] = state
+        content_index[content_hash] = contract_id
+        if len(analysis_cache) > MAX_CACHED_ANALYSES:
+            analysis_cache.popitem(last=False)
 
-        # Calculate processing time
-        start_time = datetime.fromisoformat(state["started_at"])
-        end_time = datetime.fromisoformat(state["completed_at"])
-        processing_time = (end_time - start_time).total_seconds()
+        # Write through to the shared store so other workers (and this
+        # one after a restart) can serve the finished result
+        response = _build_analysis_response(state)
+        get_result_store().save(
+            contract_id, response.model_dump_json(), content_hash)
 
-        # Build response
-        if state["final_report"]:
-            final_report = FinalReportResponse(
-                executive_summary=state["final_report"]["executive_summary"],
-                detailed_analysis=DetailedAnalysisResponse(
-                    **state["final_report"]["detailed_analysis"]),
-                risk_matrix=RiskMatrixResponse(
-                    **state["final_report"]["risk_matrix"]),
-                action_items=state["final_report"]["action_items"],
-                approval_recommendation=state["final_report"]["approval_recommendation"]
-            )
-        else:
-            final_report = None
-
-        return ContractAnalysisResponse(
-            contract_id=state["contract_metadata"]["contract_id"],
-            filename=state["contract_metadata"]["filename"],
-            status=state["status"].value,
-            started_at=state["started_at"],
-            completed_at=state["completed_at"],
-            final_report=final_report,
-            processing_time_seconds=processing_time,
-            errors=state.get("errors", []) if state.get("errors") else None
-        )
+        return response
 
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/results/{contract_id}", response_model=ContractAnalysisResponse)
-async def get_analysis_results(contract_id: str):
+def _stage_event(stage: str, state: dict) -> str:
+    """Format one workflow stage as a Server-Sent Events data frame"""
+    payload = {
+        "stage": stage,
+        "contract_id": state["contract_metadata"]["contract_id"],
+        "status": state["status"].value
+    }
+
+    if stage == "parser":
+        payload["sections"] = len(state["parser_output"]["structured_sections"])
+        payload["extraction_confidence"] = (
+            state["parser_output"]["extraction_confidence"])
+    elif stage == "legal":
+        payload["contract_type"] = state["legal_analysis"]["contract_type"]
+        payload["clauses_identified"] = len(
+            state["legal_analysis"]["clauses_identified"])
+    elif stage == "risk":
+        payload["overall_risk_score"] = (
+            state["risk_assessment"]["overall_risk_score"])
+    elif stage == "final":
+        payload["result"] = _build_analysis_response(state).model_dump()
+
+    return f"data: {json_io.dumps(payload)}\n\n"
+
+
+@app.post("/api/analyze/stream")
+async def analyze_contract_stream(
+    file: UploadFile = File(...),
+    user_instructions: Optional[str] = Form(None),
+    priority_level: str = Form("medium")
+):
     """
-    Get analysis results for a specific contract
+    Upload and analyze a contract, streaming stage results via SSE
+
+    Emits a Server-Sent Event after each workflow stage (parser, legal,
+    risk, final) so clients can render progress instead of waiting the
+    full 30-60s for the complete report. The "final" event carries the
+    same payload /api/analyze returns.
     """
-    if contract_id not in analysis_cache:
-        raise HTTPException(
-            status_code=404, detail="Contract analysis not found")
+    logger.info(f"Received streaming analysis request for: {file.filename}")
 
-    state = analysis_cache[contract_id]
+    _check_memory_pressure()
 
-    # Calculate processing time if completed
+    if not file.filename.endswith(('.pdf', '.txt')):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF and TXT files are supported"
+        )
+
+    content, content_hash = await _read_upload(file)
+    file_size = len(content)
+
+    # Same dedupe as /api/analyze: identical bytes get the finished
+    # report as a single "final" event instead of a fresh pipeline run
+    cached_response = _lookup_cached_response(content_hash)
+    if cached_response is not None:
+        async def cached_stream():
+            payload = {
+                "stage": "final",
+                "contract_id": cached_response.contract_id,
+                "status": cached_response.status,
+                "result": cached_response.model_dump()
+            }
+            yield f"data: {json_io.dumps(payload)}\n\n"
+
+        return StreamingResponse(
+            cached_stream(), media_type="text/event-stream")
+
+    async def event_stream():
+        try:
+            async with analysis_sem:
+                async for stage, state in orchestrator.analyze_contract_stream(
+                    filename=file.filename,
+                    file_size=file_size,
+                    user_instructions=user_instructions,
+                    priority_level=priority_level,
+                    file_content=content
+                ):
+                    if stage == "final":
+                        # Keep the caches consistent with /api/analyze
+                        contract_id = state["contract_metadata"]["contract_id"]
+                        analysis_cache[contract_id] = state
+                        content_index[content_hash] = contract_id
+                        if len(analysis_cache) > MAX_CACHED_ANALYSES:
+                            analysis_cache.popitem(last=False)
+                        get_result_store().save(
+                            contract_id,
+                            _build_analysis_response(state).model_dump_json(),
+                            content_hash
+                        )
+                    yield _stage_event(stage, state)
+        except Exception as e:
+            logger.error(f"Streaming analysis failed: {str(e)}")
+            error_payload = {"stage": "error", "detail": str(e)}
+            yield f"data: {json_io.dumps(error_payload)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+def _build_analysis_response(state: dict) -> ContractAnalysisResponse:
+    """Build the API response model from a contract state"""
+    # Duration comes from the monotonic marks; parsing the ISO strings
+    # back into datetimes is both slower and subject to clock steps
     processing_time = None
-    if state["completed_at"]:
+    if state.get("completed_perf") is not None:
+        processing_time = state["completed_perf"] - state["started_perf"]
+    elif state["completed_at"]:
         start_time = datetime.fromisoformat(state["started_at"])
         end_time = datetime.fromisoformat(state["completed_at"])
         processing_time = (end_time - start_time).total_seconds()
 
-    # Build response
     if state["final_report"]:
         final_report = FinalReportResponse(
             executive_summary=state["final_report"]["executive_summary"],
@@ -398,6 +709,27 @@ async def get_analysis_results(contract_id: str):
     )
 
 
+@app.get("/api/results/{contract_id}", response_model=ContractAnalysisResponse)
+async def get_analysis_results(contract_id: str):
+    """
+    Get analysis results for a specific contract
+    """
+    if contract_id not in analysis_cache:
+        # Fall through to the shared store: the analysis may have run
+        # on another worker or before a restart
+        stored_response = get_result_store().get_response(contract_id)
+        if stored_response is not None:
+            return ContractAnalysisResponse.model_validate_json(
+                stored_response)
+        raise HTTPException(
+            status_code=404, detail="Contract analysis not found")
+
+    state = analysis_cache[contract_id]
+    analysis_cache.move_to_end(contract_id)
+
+    return _build_analysis_response(state)
+
+
 @app.get("/api/contracts")
 async def list_contracts():
     """
@@ -14,6 +14,8 @@ class HealthResponse(BaseModel):
     timestamp: str
     version: str = "1.0.0"
     agents_status: Dict[str, str]
+    # Analyses currently holding the admission semaphore
+    analyses_in_flight: int = 0
 
 
 class ContractUploadResponse(BaseModel):
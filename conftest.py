@@ -0,0 +1,3 @@
+# Root conftest so pytest puts the repository root on sys.path; the
+# test modules import core/ and agents/ as top-level packages.
+# Script-style runs need the same thing: PYTHONPATH=. python tests/<file>.py
@@ -4,17 +4,64 @@ Defines agent roles, goals, and backstories
 """
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Dict, Any, Optional, List
-from crewai import Agent, Task
+from crewai import Agent, Crew, Task
 from loguru import logger
+import asyncio
 import os
 
+from core.config import get_settings
+from core.llm import get_shared_llm
 from core.state import (
     ContractState, AgentType, MessageType,
     create_agent_message, ProcessingStatus
 )
 
 
+# Shared gate on in-flight LLM calls across every agent in the process,
+# sized from settings; created lazily so importing this module does not
+# require a configured environment
+_GLOBAL_LLM_SEMAPHORE: Optional[asyncio.Semaphore] = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Get or create the process-wide LLM concurrency semaphore"""
+    global _GLOBAL_LLM_SEMAPHORE
+    if _GLOBAL_LLM_SEMAPHORE is None:
+        _GLOBAL_LLM_SEMAPHORE = asyncio.Semaphore(
+            get_settings().max_concurrent_llm_calls)
+    return _GLOBAL_LLM_SEMAPHORE
+
+
+class _GatedCrewStream:
+    """
+    Streaming crew output that executes under the LLM semaphore
+
+    With stream=True, kickoff_async returns its output object
+    immediately and the crew only starts running on first iteration —
+    so the semaphore must be held across the iteration itself, not
+    around the kickoff call, or the streamed LLM call runs entirely
+    outside the concurrency gate.
+    """
+
+    def __init__(self, crew: Crew, semaphore: asyncio.Semaphore):
+        self._crew = crew
+        self._semaphore = semaphore
+        self._output = None
+
+    @property
+    def result(self):
+        """The final crew result, available after iteration completes"""
+        return self._output.result
+
+    async def __aiter__(self):
+        async with self._semaphore:
+            self._output = await self._crew.kickoff_async()
+            async for chunk in self._output:
+                yield chunk
+
+
 class BaseContractAgent(ABC):
     """
     Abstract base class for all agents in the system
@@ -34,6 +81,15 @@ class BaseContractAgent(ABC):
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
+        # All agents on the same model share one LLM instance (and its
+        # connection pool) instead of wiring up four of them
+        self.llm = get_shared_llm(model)
+
+        # Crew.AI verbose output stringifies every intermediate thought
+        # to stdout - synchronous formatted I/O on the critical path.
+        # Off unless explicitly enabled for debugging.
+        self.verbose = get_settings().agent_verbose
+
         # Create Crew.AI agent
         self.agent = self._create_agent()
 
@@ -83,7 +139,8 @@ class BaseContractAgent(ABC):
         self,
         description: str,
         expected_output: str,
-        context: Optional[List[Task]] = None
+        context: Optional[List[Task]] = None,
+        agent: Optional[Agent] = None
     ) -> Task:
         """
         Create a Crew.AI task for this agent
@@ -92,29 +149,96 @@ class BaseContractAgent(ABC):
             description: What the agent needs to do
             expected_output: What output format is expected
             context: Optional list of previous tasks for context
+            agent: Per-run Agent to bind instead of the shared one;
+                crews that run concurrently must each pass their own
+                (see fresh_agent)
 
         Returns:
             Configured Task object
         """
         return Task(
             description=description,
-            agent=self.agent,
+            agent=agent or self.agent,
             expected_output=expected_output,
             context=context or []
         )
 
+    def fresh_agent(self) -> Agent:
+        """
+        Build a Crew.AI agent for a single crew run
+
+        Crew.AI agents are not safe to share across concurrent crews:
+        each run rebuilds and replaces the agent's executor and appends
+        to its message list in place, so overlapping kickoffs through
+        one instance cross prompts between tasks. Construction is cheap
+        because the expensive part - the LLM client - is shared, so any
+        crew that may overlap another gets its own instance from here.
+        """
+        return self._create_agent()
+
+    async def run_crew(self, crew: Crew) -> Any:
+        """
+        Execute a crew without blocking the event loop
+
+        Awaits kickoff_async under the process-wide semaphore so a burst
+        of concurrent contracts cannot flood the LLM provider; bounded
+        concurrency keeps per-call latency predictable while still
+        overlapping the network-bound round-trips.
+
+        kickoff_async runs the crew's synchronous internals off the
+        event loop, so gather-based callers genuinely overlap; call
+        sites must not add their own asyncio.to_thread wrapper around
+        agent methods, which would only stack a second thread hop on
+        top.
+
+        Streaming crews (stream=True) get a wrapper that acquires the
+        semaphore when iteration starts and holds it until the stream
+        is drained, since their kickoff_async returns before any LLM
+        work happens.
+
+        Args:
+            crew: Configured Crew to execute
+
+        Returns:
+            The crew result (or a gated stream for stream=True crews)
+        """
+        if getattr(crew, "stream", False):
+            return _GatedCrewStream(crew, _get_llm_semaphore())
+
+        async with _get_llm_semaphore():
+            return await crew.kickoff_async()
+
+    def compose_prompt(self, static_block: str, dynamic_block: str) -> str:
+        """
+        Compose a task prompt as [static scaffold, dynamic data]
+
+        Provider-side prompt caches (OpenAI automatic prefix caching,
+        Anthropic cache_control) match on shared prefixes, so the
+        invariant instructions/schema must come first and the
+        per-contract data last. Crew.AI's Task API does not expose
+        message-level cache_control, so a stable prefix ordering is
+        how we opt in to the automatic caches.
+
+        Args:
+            static_block: Invariant instructions and output schema
+            dynamic_block: Per-contract data that varies every call
+
+        Returns:
+            The composed prompt string
+        """
+        return f"{static_block}\n\n{dynamic_block}"
+
     def log_processing_step(
         self,
         state: ContractState,
         message: str
     ) -> ContractState:
         """Add a log entry to the processing logs"""
-        from datetime import datetime
         timestamp = datetime.utcnow().isoformat()
         log_entry = f"[{timestamp}] [{self.agent_type.value}] {message}"
 
         state["processing_logs"].append(log_entry)
-        logger.info(log_entry)
+        logger.debug(log_entry)
 
         return state
 
@@ -125,7 +249,6 @@ class BaseContractAgent(ABC):
         error_details: Optional[Dict[str, Any]] = None
     ) -> ContractState:
         """Record an error in the state"""
-        from datetime import datetime
         error_entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "agent": self.agent_type.value,
@@ -162,6 +285,62 @@ class BaseContractAgent(ABC):
 
         return state
 
+    def batch_update(
+        self,
+        state: ContractState,
+        status: Optional[ProcessingStatus] = None,
+        completed_at: Optional[str] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        errors: Optional[List[Dict[str, Any]]] = None
+    ) -> ContractState:
+        """
+        Apply several state mutations in a single pass
+
+        Chaining update_status / send_message / add_error walks the
+        state dict once per helper; a multi-field tail (status flip,
+        completion timestamp, completion message) collapses into one
+        call and one log line here.
+
+        Args:
+            state: Current contract state
+            status: New processing status, if changing
+            completed_at: Completion timestamp, if finishing
+            messages: Dicts with to_agent, message_type and content
+                keys, one message appended per dict
+            errors: Error dicts per add_error (message, details)
+
+        Returns:
+            Updated contract state
+        """
+        if status is not None:
+            state["status"] = status
+        if completed_at is not None:
+            state["completed_at"] = completed_at
+
+        for msg in messages or []:
+            state["messages"].append(create_agent_message(
+                from_agent=self.agent_type,
+                to_agent=msg.get("to_agent"),
+                message_type=msg["message_type"],
+                content=msg.get("content", {})
+            ))
+
+        for err in errors or []:
+            state["errors"].append({
+                "timestamp": datetime.utcnow().isoformat(),
+                "agent": self.agent_type.value,
+                "message": err["message"],
+                "details": err.get("details", {})
+            })
+
+        logger.info(
+            f"Batch update by {self.agent_type.value}: "
+            f"status={status.value if status else 'unchanged'}, "
+            f"messages={len(messages or [])}, errors={len(errors or [])}"
+        )
+
+        return state
+
     def update_status(
         self,
         state: ContractState,
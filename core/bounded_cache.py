@@ -0,0 +1,40 @@
+"""
+Bounded LRU Cache
+OrderedDict with a size cap for long-lived in-memory result caches
+"""
+
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class BoundedCache(OrderedDict):
+    """
+    Dict-compatible LRU cache with a fixed entry cap
+
+    The module-level result caches live for the whole server process;
+    an unbounded dict grows with every distinct contract ever seen.
+    This keeps the plain dict interface the agents already use but
+    evicts the least-recently-used entry once maxsize is exceeded,
+    matching the bound the API layer applies to analysis_cache.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
@@ -0,0 +1,126 @@
+"""
+Delta Cache for Iterative Contract Edits
+Detects near-identical re-uploads and exposes only the changed text
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+import hashlib
+
+from core.bounded_cache import BoundedCache
+
+
+class DeltaResult(NamedTuple):
+    """The changed tail of a re-uploaded document"""
+    changed_text: str
+    unchanged_ratio: float
+
+
+class PriorRun(NamedTuple):
+    """Block hashes and verdicts recorded from a previous analysis"""
+    block_hashes: List[str]
+    blocks: List[str]
+    risk_assessment: Dict
+    legal_analysis: Optional[Dict]
+
+
+# Previous runs keyed by document fingerprint (filename), in-memory
+# like the other result caches; the cap is smaller because each entry
+# retains the full block text of its document
+_prior_runs: Dict[str, PriorRun] = BoundedCache(maxsize=64)
+
+
+def split_blocks(raw_text: str) -> List[str]:
+    """Split document text into paragraph-sized blocks"""
+    return [block for block in raw_text.split("\n\n") if block.strip()]
+
+
+def hash_blocks(blocks: List[str]) -> List[str]:
+    """Per-block SHA-256 hashes for cheap change detection"""
+    return [
+        hashlib.sha256(block.encode("utf-8")).hexdigest()
+        for block in blocks
+    ]
+
+
+def get_prior_run(fingerprint: str) -> Optional[PriorRun]:
+    """Look up the recorded run for a document fingerprint"""
+    return _prior_runs.get(fingerprint)
+
+
+def store_run(
+    fingerprint: str,
+    blocks: List[str],
+    risk_assessment: Dict,
+    legal_analysis: Optional[Dict] = None
+) -> None:
+    """Record a completed run for future delta evaluation"""
+    _prior_runs[fingerprint] = PriorRun(
+        block_hashes=hash_blocks(blocks),
+        blocks=blocks,
+        risk_assessment=risk_assessment,
+        legal_analysis=legal_analysis
+    )
+
+
+def try_delta(
+    prior: PriorRun,
+    blocks: List[str],
+    threshold: float = 0.2
+) -> Optional[DeltaResult]:
+    """
+    Compute the changed portion of an edited document
+
+    Compares block hashes against the prior run; if the change is small
+    (unchanged fraction >= 1 - threshold) the blocks past the longest
+    common prefix are returned as the delta, so a re-analysis prompt can
+    carry only the edited text plus the prior verdict instead of the
+    whole contract.
+
+    Args:
+        prior: The recorded previous run
+        blocks: Blocks of the newly uploaded document
+        threshold: Maximum changed fraction to still use the delta path
+
+    Returns:
+        DeltaResult with the changed tail, or None if the edit is too
+        large to treat as a delta
+    """
+    if not blocks or not prior.block_hashes:
+        return None
+
+    curr_hashes = hash_blocks(blocks)
+
+    # Jaccard overlap on the hash sets: a cheap first gate
+    prev_set = set(prior.block_hashes)
+    curr_set = set(curr_hashes)
+    overlap = len(prev_set & curr_set) / len(prev_set | curr_set)
+    if overlap < 1 - threshold:
+        return None
+
+    # Longest common prefix; everything past it is the changed tail
+    common = 0
+    for prev_hash, curr_hash in zip(prior.block_hashes, curr_hashes):
+        if prev_hash != curr_hash:
+            break
+        common += 1
+
+    changed_blocks = blocks[common:]
+    if not changed_blocks:
+        if len(blocks) == len(prior.block_hashes):
+            # Identical document; no delta prompt needed, caller should
+            # use the stored verdict directly
+            return DeltaResult(changed_text="", unchanged_ratio=1.0)
+        # Strict prefix of the prior run: trailing blocks were deleted
+        # (e.g. a liability clause dropped). That is an edit, and there
+        # is no changed text to build a delta prompt from, so force the
+        # full path rather than echoing the stale verdict
+        return None
+
+    changed_ratio = len(changed_blocks) / len(blocks)
+    if changed_ratio > threshold:
+        return None
+
+    return DeltaResult(
+        changed_text="\n\n".join(changed_blocks),
+        unchanged_ratio=1 - changed_ratio
+    )
@@ -0,0 +1,242 @@
+"""
+JSON Extraction Utilities
+Locates and parses JSON payloads embedded in LLM output
+"""
+
+from typing import Any, Callable, Dict, Optional
+from loguru import logger
+import hashlib
+
+from core import json_io
+
+try:
+    import json_repair
+except ImportError:
+    json_repair = None
+
+
+# Parse-outcome counters so recovery and fallback rates are visible to
+# operators (a fallback wastes a full GPT-4 call on default values)
+parse_stats: Dict[str, int] = {"recovered": 0, "fallback": 0}
+
+
+class FallbackResult(dict):
+    """
+    Marks a dict built by the fallback_factory rung of the ladder
+
+    Behaves exactly like the dict it wraps; callers that cache parsed
+    results check is_fallback() so a transiently malformed response
+    does not pin its default-values junk in a content-keyed cache.
+    """
+
+
+def is_fallback(parsed: Dict[str, Any]) -> bool:
+    """Whether a parse_llm_json result came from the fallback factory"""
+    return isinstance(parsed, FallbackResult)
+
+
+def find_fenced_json(text: str) -> Optional[str]:
+    """
+    Extract the body of the first ```json fenced block
+
+    Plain str.find is a few dozen instructions against a full regex
+    scan of the output; the fenced block is the overwhelmingly common
+    shape of LLM answers, so the fast path matters.
+
+    Args:
+        text: Raw LLM output that may contain a fenced JSON block
+
+    Returns:
+        The stripped fence body, or None if no complete fence exists
+    """
+    start = text.find('```json')
+    if start == -1:
+        return None
+    end = text.find('```', start + 7)
+    if end == -1:
+        return None
+    return text[start + 7:end].strip()
+
+
+def find_json_object(text: str) -> Optional[str]:
+    """
+    Find the first complete JSON object in a string
+
+    Runs a single linear pass tracking brace depth and string state,
+    replacing the nested-braces regex whose backtracking was quadratic
+    on outputs containing many braces.
+
+    Args:
+        text: Raw LLM output that may embed a JSON object
+
+    Returns:
+        The substring spanning the first balanced {...}, or None
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+
+class JSONStreamScanner:
+    """
+    Incrementally detects the first complete JSON object in a stream
+
+    Feed chunks as they arrive; the scanner tracks brace depth and
+    string state across chunk boundaries and returns the full object
+    text the moment the outer brace closes, so parsing and validation
+    can start without waiting for the end of the response. The unread
+    remainder of the closing chunk is kept in ``tail`` so a caller that
+    rejects the object can hand it to a fresh scanner and keep looking.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._complete = False
+        self.tail: str = ""
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Consume the next chunk of streamed text
+
+        Args:
+            chunk: The next piece of the response
+
+        Returns:
+            The complete JSON object text if it closed within this
+            chunk, otherwise None
+        """
+        if self._complete:
+            return None
+
+        for i, char in enumerate(chunk):
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                else:
+                    continue
+
+            self._parts.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete = True
+                    self.tail = chunk[i + 1:]
+                    return ''.join(self._parts)
+
+        return None
+
+
+def parse_llm_json(
+    result: Any,
+    fallback_factory: Callable[[str], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Parse a Crew.AI result into a dict
+
+    Shared ladder used by every agent: dict passthrough, direct
+    json.loads, fenced markdown block, then the linear brace scanner.
+    If none succeed, the caller-supplied fallback_factory builds a
+    default structure from the raw text.
+
+    The result is stringified exactly once; the same string feeds every
+    rung of the ladder including the fallback, so a multi-KB response is
+    never re-converted on the error path.
+
+    Args:
+        result: Raw Crew.AI result (dict, string, or CrewOutput)
+        fallback_factory: Builds a default dict from the raw result text
+
+    Returns:
+        Parsed result dict, or the fallback structure
+    """
+    if isinstance(result, dict):
+        return result
+
+    result_str = result if isinstance(result, str) else str(result)
+
+    try:
+        return json_io.loads(result_str)
+    except ValueError:
+        pass
+
+    fenced = find_fenced_json(result_str)
+    if fenced:
+        try:
+            return json_io.loads(fenced)
+        except ValueError:
+            pass
+
+    json_str = find_json_object(result_str)
+    if json_str:
+        try:
+            return json_io.loads(json_str)
+        except ValueError:
+            pass
+
+    # Last resort before discarding the whole response: repair common
+    # LLM malformations (trailing commas, unterminated strings) so one
+    # missing comma does not waste an entire paid-for completion
+    if json_repair is not None:
+        try:
+            repaired = json_repair.loads(result_str)
+        except Exception:
+            repaired = None
+        if isinstance(repaired, dict) and repaired:
+            parse_stats["recovered"] += 1
+            logger.warning(
+                "Recovered malformed LLM JSON via repair "
+                f"(output sha256={hashlib.sha256(result_str.encode('utf-8')).hexdigest()[:12]})"
+            )
+            return repaired
+
+    parse_stats["fallback"] += 1
+    logger.warning(
+        "Could not extract JSON from LLM result, using fallback "
+        f"(output sha256={hashlib.sha256(result_str.encode('utf-8')).hexdigest()[:12]})"
+    )
+    return FallbackResult(fallback_factory(result_str))
@@ -0,0 +1,29 @@
+"""
+JSON I/O Helpers
+Rust-backed orjson for LLM payload parsing, with a stdlib fallback
+"""
+
+from typing import Any
+
+try:
+    import orjson
+
+    def loads(data: Any) -> Any:
+        """Parse JSON from a str or bytes payload"""
+        return orjson.loads(data)
+
+    def dumps(obj: Any, sort_keys: bool = False) -> str:
+        """Serialize to a compact JSON string"""
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+
+except ImportError:
+    import json as _json
+
+    def loads(data: Any) -> Any:
+        """Parse JSON from a str or bytes payload"""
+        return _json.loads(data)
+
+    def dumps(obj: Any, sort_keys: bool = False) -> str:
+        """Serialize to a compact JSON string"""
+        return _json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys)
@@ -0,0 +1,30 @@
+"""
+Shared LLM Instances
+One Crew.AI LLM object per model name, reused by every agent
+"""
+
+from typing import Dict
+from crewai import LLM
+
+
+# Process-wide pool: four agents on the same model share one LLM object
+# (and its underlying HTTP connection pool) instead of each wiring up
+# their own
+_llm_pool: Dict[str, LLM] = {}
+
+
+def get_shared_llm(model: str) -> LLM:
+    """
+    Get or create the process-wide LLM instance for a model
+
+    Args:
+        model: Model name, e.g. "gpt-4-turbo-preview"
+
+    Returns:
+        The shared LLM instance for that model
+    """
+    llm = _llm_pool.get(model)
+    if llm is None:
+        llm = LLM(model=model)
+        _llm_pool[model] = llm
+    return llm
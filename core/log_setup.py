@@ -0,0 +1,29 @@
+"""
+Logging Configuration
+Switches loguru to a queue-backed sink off the event loop
+"""
+
+import sys
+
+from loguru import logger
+
+from core.config import get_settings
+
+
+def configure_logging() -> None:
+    """
+    Route log records through loguru's background writer thread
+
+    The default sink writes to stderr synchronously, so every
+    logger.info in the analysis path blocks the event loop on the
+    write — noticeable in containers where stderr is line-buffered
+    and can stall under backpressure. With enqueue=True the calling
+    coroutine only pays for putting the record on a queue; a
+    background thread does the formatting and I/O.
+    """
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        enqueue=True,
+        level=get_settings().log_level
+    )
@@ -5,6 +5,9 @@ Manages the execution of all agents in the correct sequence
 
 from typing import Optional
 from loguru import logger
+import asyncio
+import copy
+import time
 import uuid
 from datetime import datetime
 
@@ -20,15 +23,33 @@ class ContractAnalysisOrchestrator:
     Orchestrates the complete contract analysis workflow
     """
 
-    def __init__(self):
-        """Initialize all agents"""
+    def __init__(
+        self,
+        parser: Optional[ParserAgent] = None,
+        legal: Optional[LegalAgent] = None,
+        risk: Optional[RiskAgent] = None,
+        coordinator: Optional[CoordinatorAgent] = None
+    ):
+        """
+        Initialize all agents
+
+        Already-constructed agents can be injected so callers that have
+        warmed them up (tests, embedding applications) do not pay the
+        construction cost twice; by default each is built once here and
+        reused for the orchestrator's lifetime.
+
+        Sharing the wrappers across in-flight analyses is safe because
+        every crew run binds a fresh Crew.AI Agent (fresh_agent on the
+        base class); only the LLM clients and result caches are
+        long-lived, and those are designed to be shared.
+        """
         logger.info("Initializing Contract Analysis Orchestrator")
 
         try:
-            self.parser = ParserAgent()
-            self.legal = LegalAgent()
-            self.risk = RiskAgent()
-            self.coordinator = CoordinatorAgent()
+            self.parser = parser or ParserAgent()
+            self.legal = legal or LegalAgent()
+            self.risk = risk or RiskAgent()
+            self.coordinator = coordinator or CoordinatorAgent()
 
             logger.success("All agents initialized successfully")
 
@@ -36,12 +57,37 @@ class ContractAnalysisOrchestrator:
             logger.error(f"Failed to initialize agents: {str(e)}")
             raise
 
+    @classmethod
+    async def create(cls) -> "ContractAnalysisOrchestrator":
+        """
+        Build an orchestrator with the four agents constructed concurrently
+
+        Agent __init__ is synchronous (Crew.AI setup, LLM client
+        handshake), so building them in sequence costs the sum of the
+        four setup times. Running each constructor in a thread and
+        gathering brings cold start down to the slowest single agent —
+        worth having where the process is started by an autoscaler.
+        """
+        parser, legal, risk, coordinator = await asyncio.gather(
+            asyncio.to_thread(ParserAgent),
+            asyncio.to_thread(LegalAgent),
+            asyncio.to_thread(RiskAgent),
+            asyncio.to_thread(CoordinatorAgent)
+        )
+        return cls(
+            parser=parser,
+            legal=legal,
+            risk=risk,
+            coordinator=coordinator
+        )
+
     async def analyze_contract(
         self,
         filename: str,
         file_size: int,
         user_instructions: Optional[str] = None,
-        priority_level: str = "medium"
+        priority_level: str = "medium",
+        file_content: Optional[bytes] = None
     ) -> ContractState:
         """
         Run the complete contract analysis workflow
@@ -51,12 +97,14 @@ class ContractAnalysisOrchestrator:
             file_size: Size of the file in bytes
             user_instructions: Optional user instructions for analysis
             priority_level: Priority level (low/medium/high/critical)
+            file_content: Raw uploaded bytes; when provided, the parser
+                analyzes the actual document instead of simulated text
 
         Returns:
             Final contract state with all analysis results
         """
         # Generate unique contract ID
-        contract_id = f"CONTRACT-{uuid.uuid4().hex[:8].upper()}"
+        contract_id = f"CONTRACT-{uuid.uuid4().hex[:8]}"
 
         logger.info("=" * 80)
         logger.info(f"Starting Contract Analysis Workflow: {contract_id}")
@@ -64,13 +112,20 @@ class ContractAnalysisOrchestrator:
             f"File: {filename} | Size: {file_size} bytes | Priority: {priority_level}")
         logger.info("=" * 80)
 
+        # Extract text from the uploaded bytes in memory, if provided
+        document_text = (
+            await self.parser.extract_text(filename, file_content)
+            if file_content else None
+        )
+
         # Create initial state
         state = create_initial_state(
             contract_id=contract_id,
             filename=filename,
             file_size=file_size,
             user_instructions=user_instructions,
-            priority_level=priority_level
+            priority_level=priority_level,
+            document_text=document_text
         )
 
         try:
@@ -85,25 +140,31 @@ class ContractAnalysisOrchestrator:
             logger.success(
                 f"✓ Parsing complete: {len(state['parser_output']['structured_sections'])} sections")
 
-            # STEP 2: Legal Analysis
-            logger.info("\n⚖️  STEP 2/4: Legal Analysis")
+            # STEPS 2+3: Legal Analysis and Risk Assessment in parallel.
+            # Both only need parser_output, so their LLM round-trips
+            # overlap instead of running back to back. Shallow copies
+            # give each branch its own top-level slots while the shared
+            # messages/logs/errors lists keep accumulating in place.
+            logger.info("\n⚖️ 🎯 STEPS 2-3/4: Legal Analysis + Risk Assessment (parallel)")
             logger.info("─" * 60)
-            state = await self.legal.handle_processing(state)
-
-            if state["status"] == ProcessingStatus.FAILED:
+            legal_state, risk_state = await asyncio.gather(
+                self.legal.handle_processing(copy.copy(state)),
+                self.risk.handle_processing(copy.copy(state))
+            )
+
+            # Merge the branch outputs back into the main state
+            state["legal_analysis"] = legal_state["legal_analysis"]
+            state["legal_plus_risk_seed"] = legal_state.get("legal_plus_risk_seed")
+            state["risk_assessment"] = risk_state["risk_assessment"]
+            state["status"] = ProcessingStatus.RISK_ASSESSMENT
+
+            if not state["legal_analysis"]:
                 raise Exception("Legal agent failed")
+            if not state["risk_assessment"]:
+                raise Exception("Risk agent failed")
 
             logger.success(
                 f"✓ Legal analysis complete: {len(state['legal_analysis']['clauses_identified'])} clauses")
-
-            # STEP 3: Risk Assessment
-            logger.info("\n🎯 STEP 3/4: Risk Assessment")
-            logger.info("─" * 60)
-            state = await self.risk.handle_processing(state)
-
-            if state["status"] == ProcessingStatus.FAILED:
-                raise Exception("Risk agent failed")
-
             logger.success(
                 f"✓ Risk assessment complete: Score {state['risk_assessment']['overall_risk_score']}/10")
 
@@ -119,6 +180,7 @@ class ContractAnalysisOrchestrator:
 
             # Mark completion time
             state["completed_at"] = datetime.utcnow().isoformat()
+            state["completed_perf"] = time.perf_counter()
 
             logger.info("\n" + "=" * 80)
             logger.success(f"✅ Analysis Complete: {contract_id}")
@@ -136,9 +198,146 @@ class ContractAnalysisOrchestrator:
             # Update state with error
             state["status"] = ProcessingStatus.FAILED
             state["completed_at"] = datetime.utcnow().isoformat()
+            state["completed_perf"] = time.perf_counter()
+
+            raise
+
+    async def analyze_contract_stream(
+        self,
+        filename: str,
+        file_size: int,
+        user_instructions: Optional[str] = None,
+        priority_level: str = "medium",
+        file_content: Optional[bytes] = None
+    ):
+        """
+        Run the workflow, yielding (stage, state) as stages complete
+
+        Streaming variant of analyze_contract for progressive clients:
+        emits after parsing, after each of the parallel legal and risk
+        branches finishes (in completion order), and after synthesis.
+        The final yield carries the fully populated state.
+
+        Yields:
+            (stage, state) tuples with stage in
+            "parser" / "legal" / "risk" / "final"
+        """
+        contract_id = f"CONTRACT-{uuid.uuid4().hex[:8]}"
+
+        logger.info(f"Starting streaming analysis workflow: {contract_id}")
+
+        document_text = (
+            await self.parser.extract_text(filename, file_content)
+            if file_content else None
+        )
+
+        state = create_initial_state(
+            contract_id=contract_id,
+            filename=filename,
+            file_size=file_size,
+            user_instructions=user_instructions,
+            priority_level=priority_level,
+            document_text=document_text
+        )
+
+        try:
+            state = await self.parser.handle_processing(state)
+            if state["status"] == ProcessingStatus.FAILED:
+                raise Exception("Parser agent failed")
+            yield "parser", state
+
+            # Same parallel fan-out as analyze_contract, but each branch
+            # is surfaced the moment it finishes rather than after both
+            legal_task = asyncio.ensure_future(
+                self.legal.handle_processing(copy.copy(state)))
+            risk_task = asyncio.ensure_future(
+                self.risk.handle_processing(copy.copy(state)))
+
+            pending = {legal_task, risk_task}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    branch_state = task.result()
+                    if task is legal_task:
+                        state["legal_analysis"] = branch_state["legal_analysis"]
+                        state["legal_plus_risk_seed"] = branch_state.get(
+                            "legal_plus_risk_seed")
+                        yield "legal", state
+                    else:
+                        state["risk_assessment"] = branch_state["risk_assessment"]
+                        yield "risk", state
+
+            state["status"] = ProcessingStatus.RISK_ASSESSMENT
+            if not state["legal_analysis"]:
+                raise Exception("Legal agent failed")
+            if not state["risk_assessment"]:
+                raise Exception("Risk agent failed")
+
+            state = await self.coordinator.handle_processing(state)
+            if state["status"] == ProcessingStatus.FAILED:
+                raise Exception("Coordinator agent failed")
+
+            state["completed_at"] = datetime.utcnow().isoformat()
+            state["completed_perf"] = time.perf_counter()
+
+            logger.success(f"✅ Streaming analysis complete: {contract_id}")
+            yield "final", state
+
+        except Exception as e:
+            logger.error(f"Streaming workflow failed: {str(e)}")
+
+            state["status"] = ProcessingStatus.FAILED
+            state["completed_at"] = datetime.utcnow().isoformat()
+            state["completed_perf"] = time.perf_counter()
 
             raise
 
+    async def analyze_contracts(
+        self,
+        contracts: list,
+        user_instructions: Optional[str] = None,
+        priority_level: str = "medium"
+    ) -> list:
+        """
+        Analyze several contracts concurrently
+
+        Overlaps the LLM round-trips of independent contracts via
+        asyncio.gather; the process-wide semaphore in the base agent
+        bounds how many calls are in flight at once. Failed contracts
+        are returned as exceptions in place of their state rather than
+        aborting the whole batch.
+
+        Each contract runs its own full pipeline, so a slow parse on
+        one document never holds back another contract's legal or risk
+        stage. Keep it that way: do not restructure this into
+        stage-wide batches ("await all parsers, then start legal"),
+        which would reintroduce head-of-line blocking at every stage
+        boundary.
+
+        Args:
+            contracts: List of (filename, file_size) tuples
+            user_instructions: Optional instructions applied to each
+            priority_level: Priority level applied to each
+
+        Returns:
+            List of final states (or exceptions), in input order
+        """
+        logger.info(f"Starting batch analysis of {len(contracts)} contracts")
+
+        return await asyncio.gather(
+            *(
+                self.analyze_contract(
+                    filename=filename,
+                    file_size=file_size,
+                    user_instructions=user_instructions,
+                    priority_level=priority_level
+                )
+                for filename, file_size in contracts
+            ),
+            return_exceptions=True
+        )
+
     def get_status(self) -> dict:
         """Get orchestrator status"""
         return {
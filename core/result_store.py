@@ -0,0 +1,86 @@
+"""
+Persistent Analysis Result Store
+SQLite-backed storage shared across workers and restarts
+"""
+
+from typing import Optional
+import sqlite3
+import threading
+
+from core.config import get_settings
+
+
+class ResultStore:
+    """
+    Stores serialized analysis responses in a SQLite file
+
+    The in-process analysis_cache is per worker; under multiple uvicorn
+    workers each one misses on results another worker produced. A
+    WAL-mode SQLite file on shared disk gives every worker the same
+    view without standing up a separate cache service.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_results (
+                contract_id TEXT PRIMARY KEY,
+                content_hash TEXT,
+                response_json TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_content_hash
+            ON analysis_results (content_hash)
+        """)
+        self._conn.commit()
+
+    def save(
+        self,
+        contract_id: str,
+        response_json: str,
+        content_hash: Optional[str] = None
+    ) -> None:
+        """Persist a serialized analysis response"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_results "
+                "(contract_id, content_hash, response_json) VALUES (?, ?, ?)",
+                (contract_id, content_hash, response_json)
+            )
+            self._conn.commit()
+
+    def get_response(self, contract_id: str) -> Optional[str]:
+        """Look up a serialized response by contract ID"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response_json FROM analysis_results "
+                "WHERE contract_id = ?",
+                (contract_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_id_by_hash(self, content_hash: str) -> Optional[str]:
+        """Look up the contract ID analyzed for a content hash"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT contract_id FROM analysis_results "
+                "WHERE content_hash = ? ORDER BY created_at DESC LIMIT 1",
+                (content_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+
+# Singleton instance
+_store: Optional[ResultStore] = None
+
+
+def get_result_store() -> ResultStore:
+    """Get or create the result store singleton"""
+    global _store
+    if _store is None:
+        _store = ResultStore(get_settings().result_store_path)
+    return _store
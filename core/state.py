@@ -6,7 +6,17 @@ Defines the shared state structure across all agents in the multi-agent system
 from typing import TypedDict, List, Dict, Optional, Annotated, Any
 from datetime import datetime
 from enum import Enum
+import itertools
 import operator
+import os
+import time
+
+
+# Message IDs only need in-process uniqueness for tracing; a
+# pid-prefixed counter avoids the urandom syscall uuid4 pays on every
+# inter-agent message
+_PID = os.getpid()
+_MSG_COUNTER = itertools.count()
 
 
 class AgentType(str, Enum):
@@ -101,6 +111,7 @@ class ContractState(TypedDict):
     """
     # Contract Information
     contract_metadata: ContractMetadata
+    document_text: Optional[str]
 
     # Processing Status
     status: ProcessingStatus
@@ -109,6 +120,7 @@ class ContractState(TypedDict):
     # Agent Outputs
     parser_output: Optional[ParserOutput]
     legal_analysis: Optional[LegalAnalysis]
+    legal_plus_risk_seed: Optional[Dict[str, Any]]
     risk_assessment: Optional[RiskAssessment]
     final_report: Optional[FinalReport]
 
@@ -122,6 +134,10 @@ class ContractState(TypedDict):
     # Timing
     started_at: str
     completed_at: Optional[str]
+    # Monotonic clock marks for duration math; the ISO fields above
+    # stay for display and API payloads
+    started_perf: float
+    completed_perf: Optional[float]
 
     # Additional Context
     user_instructions: Optional[str]
@@ -133,7 +149,8 @@ def create_initial_state(
     filename: str,
     file_size: int,
     user_instructions: Optional[str] = None,
-    priority_level: str = "medium"
+    priority_level: str = "medium",
+    document_text: Optional[str] = None
 ) -> ContractState:
     """
     Factory function to create initial state for a new contract analysis
@@ -148,10 +165,12 @@ def create_initial_state(
             file_size=file_size,
             num_pages=None
         ),
+        document_text=document_text,
         status=ProcessingStatus.PENDING,
         current_agent=AgentType.COORDINATOR,
         parser_output=None,
         legal_analysis=None,
+        legal_plus_risk_seed=None,
         risk_assessment=None,
         final_report=None,
         messages=[],
@@ -159,6 +178,8 @@ def create_initial_state(
         processing_logs=[],
         started_at=now,
         completed_at=None,
+        started_perf=time.perf_counter(),
+        completed_perf=None,
         user_instructions=user_instructions,
         priority_level=priority_level
     )
@@ -171,13 +192,11 @@ def create_agent_message(
     content: Dict[str, Any]
 ) -> AgentMessage:
     """Helper function to create standardized agent messages"""
-    import uuid
-
     return AgentMessage(
         from_agent=from_agent,
         to_agent=to_agent,
         message_type=message_type,
         content=content,
         timestamp=datetime.utcnow().isoformat(),
-        message_id=str(uuid.uuid4())
+        message_id=f"{_PID:x}-{next(_MSG_COUNTER):x}"
     )
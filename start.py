@@ -9,10 +9,20 @@ except ImportError:
 
 import uvicorn
 
+# uvloop and httptools cut per-request event-loop and HTTP-parsing
+# overhead; uvicorn falls back to asyncio/h11 where they are missing
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:
+    LOOP = "asyncio"
+
 if __name__ == "__main__":
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        log_level="info",
+        loop=LOOP,
+        http="auto"
     )
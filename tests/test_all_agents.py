@@ -4,6 +4,7 @@ Tests the full multi-agent workflow
 """
 
 from loguru import logger
+from core.log_setup import configure_logging
 from core.state import create_initial_state
 from agents.coordinator_agent import CoordinatorAgent
 from agents.risk_agent import RiskAgent
@@ -11,6 +12,7 @@ from agents.legal_agent import LegalAgent
 from agents.parser_agent import ParserAgent
 from dotenv import load_dotenv
 import asyncio
+import copy
 import sys
 from pathlib import Path
 
@@ -19,10 +21,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 load_dotenv()
 
 
-async def test_full_workflow():
+async def test_full_workflow(parser, legal, risk, coordinator):
     """
     Test the complete multi-agent workflow:
     Parser → Legal → Risk → Coordinator
+
+    Reuses the agents constructed during the initialization test so the
+    workflow does not pay a second round of agent setup.
     """
     logger.info("=" * 80)
     logger.info("TESTING FULL MULTI-AGENT WORKFLOW")
@@ -43,7 +48,6 @@ async def test_full_workflow():
         logger.info("STEP 1: DOCUMENT PARSING")
         logger.info("─" * 80)
 
-        parser = ParserAgent()
         state = await parser.handle_processing(state)
 
         logger.success(
@@ -51,13 +55,20 @@ async def test_full_workflow():
         logger.info(
             f"  Extraction confidence: {state['parser_output']['extraction_confidence']}")
 
-        # Step 2: Legal Agent
+        # Steps 2+3: Legal and Risk Agents in parallel, mirroring the
+        # orchestrator: both run from parser_output, so their LLM
+        # round-trips overlap instead of running back to back
         logger.info("\n" + "─" * 80)
-        logger.info("STEP 2: LEGAL ANALYSIS")
+        logger.info("STEPS 2+3: LEGAL ANALYSIS + RISK ASSESSMENT (PARALLEL)")
         logger.info("─" * 80)
 
-        legal = LegalAgent()
-        state = await legal.handle_processing(state)
+        legal_state, risk_state = await asyncio.gather(
+            legal.handle_processing(copy.copy(state)),
+            risk.handle_processing(copy.copy(state))
+        )
+        state["legal_analysis"] = legal_state["legal_analysis"]
+        state["legal_plus_risk_seed"] = legal_state.get("legal_plus_risk_seed")
+        state["risk_assessment"] = risk_state["risk_assessment"]
 
         logger.success(f"✓ Legal analysis complete")
         logger.info(
@@ -69,14 +80,6 @@ async def test_full_workflow():
         logger.info(
             f"  Obligations: {len(state['legal_analysis']['obligations'])}")
 
-        # Step 3: Risk Agent
-        logger.info("\n" + "─" * 80)
-        logger.info("STEP 3: RISK ASSESSMENT")
-        logger.info("─" * 80)
-
-        risk = RiskAgent()
-        state = await risk.handle_processing(state)
-
         logger.success(f"✓ Risk assessment complete")
         logger.info(
             f"  Overall risk score: {state['risk_assessment']['overall_risk_score']}/10")
@@ -90,7 +93,6 @@ async def test_full_workflow():
         logger.info("STEP 4: FINAL SYNTHESIS")
         logger.info("─" * 80)
 
-        coordinator = CoordinatorAgent()
         state = await coordinator.handle_processing(state)
 
         logger.success(f"✓ Synthesis complete")
@@ -153,61 +155,49 @@ async def test_full_workflow():
 
 
 async def test_individual_agents():
-    """Test each agent initialization"""
-    logger.info("\n🧪 Testing individual agent initialization...\n")
-
-    results = {}
+    """Test agent initialization fail-fast, returning the agents for reuse
 
-    # Test Parser
-    try:
-        parser = ParserAgent()
-        logger.success(f"✓ ParserAgent initialized")
-        results["parser"] = True
-    except Exception as e:
-        logger.error(f"✗ ParserAgent failed: {str(e)}")
-        results["parser"] = False
+    Constructors run concurrently in threads, matching the production
+    startup path; any failure propagates immediately with its real
+    traceback instead of being swallowed per agent.
+    """
+    logger.info("\n🧪 Testing individual agent initialization...\n")
 
-    # Test Legal
-    try:
-        legal = LegalAgent()
-        logger.success(f"✓ LegalAgent initialized")
-        results["legal"] = True
-    except Exception as e:
-        logger.error(f"✗ LegalAgent failed: {str(e)}")
-        results["legal"] = False
+    parser, legal, risk, coordinator = await asyncio.gather(
+        asyncio.to_thread(ParserAgent),
+        asyncio.to_thread(LegalAgent),
+        asyncio.to_thread(RiskAgent),
+        asyncio.to_thread(CoordinatorAgent)
+    )
 
-    # Test Risk
-    try:
-        risk = RiskAgent()
-        logger.success(f"✓ RiskAgent initialized")
-        results["risk"] = True
-    except Exception as e:
-        logger.error(f"✗ RiskAgent failed: {str(e)}")
-        results["risk"] = False
+    agents = {
+        "parser": parser,
+        "legal": legal,
+        "risk": risk,
+        "coordinator": coordinator
+    }
 
-    # Test Coordinator
-    try:
-        coordinator = CoordinatorAgent()
-        logger.success(f"✓ CoordinatorAgent initialized")
-        results["coordinator"] = True
-    except Exception as e:
-        logger.error(f"✗ CoordinatorAgent failed: {str(e)}")
-        results["coordinator"] = False
+    for name, agent in agents.items():
+        logger.success(f"✓ {type(agent).__name__} initialized")
 
-    return all(results.values())
+    return True, agents
 
 
 async def main():
     """Run all tests"""
+    # Queue-backed sink so the dozens of progress logs per contract do
+    # not serialize the workflow on stderr writes
+    configure_logging()
+
     logger.info("\n🚀 Starting Multi-Agent System Tests\n")
 
     # Test 1: Individual agent initialization
-    init_passed = await test_individual_agents()
+    init_passed, agents = await test_individual_agents()
 
-    # Test 2: Full workflow
+    # Test 2: Full workflow, on the agents already constructed above
     if init_passed:
         logger.info("\n")
-        workflow_passed = await test_full_workflow()
+        workflow_passed = await test_full_workflow(**agents)
     else:
         logger.error("Skipping workflow test due to initialization failures")
         workflow_passed = False